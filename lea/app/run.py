@@ -1,11 +1,10 @@
 from __future__ import annotations
 
+import collections
 import concurrent.futures
-import datetime as dt
 import functools
 import itertools
 import pathlib
-import pickle
 import re
 import time
 import warnings
@@ -22,6 +21,11 @@ SUCCESS = "[green]SUCCESS"
 ERRORED = "[red]ERRORED"
 SKIPPED = "[yellow]SKIPPED"
 
+# How long to wait, in seconds, for a job to finish before refreshing the progress display
+REFRESH_INTERVAL = 1
+# Minimum amount of time, in seconds, between two renders of the progress display
+RENDER_INTERVAL = 0.1
+
 
 def _do_nothing(*args, **kwargs):
     """This is a dummy function for dry runs"""
@@ -233,13 +237,13 @@ def run(
     )
 
     # Remove orphan views
-    for table_reference in client.list_tables()["table_reference"]:
-        view_key = client._table_reference_to_view_key(table_reference)
-        if view_key in dag:
-            continue
-        if not dry:
-            client.delete_view_key(view_key)
-        console_log(f"Removed {table_reference}")
+    orphan_view_keys = [
+        view_key for view_key in client.list_table_view_keys() if view_key not in dag
+    ]
+    if not dry:
+        client.delete_view_keys(orphan_view_keys)
+    for view_key in orphan_view_keys:
+        console_log(f"Removed {client._view_key_to_table_reference(view_key, with_username=True)}")
 
     def display_progress() -> rich.table.Table:
         if silent:
@@ -250,8 +254,8 @@ def run(
         table.add_column("status")
         table.add_column("duration")
 
-        not_done = [view_key for view_key in execution_order if view_key not in cache]
-        for i, view_key in list(enumerate(not_done, start=1))[-show:]:
+        now = time.monotonic()
+        for i, view_key in not_done:
             if view_key in exceptions:
                 status = ERRORED
             elif view_key in skipped:
@@ -261,85 +265,142 @@ def run(
             else:
                 status = RUNNING
             duration = (
-                (jobs_ended_at.get(view_key, dt.datetime.now()) - jobs_started_at[view_key])
+                (jobs_ended_at.get(view_key, now) - jobs_started_at[view_key])
                 if view_key in jobs_started_at
                 else None
             )
             # Round to the closest second
-            duration_str = f"{int(round(duration.total_seconds()))}s" if duration else ""
+            duration_str = f"{int(round(duration))}s" if duration is not None else ""
             table.add_row(str(i), str(dag[view_key]), status, duration_str)
 
         return table
 
+    def end_job(future: concurrent.futures.Future):
+        # We notify the DAG by calling done when a job is done, which will unlock the next views
+        view_key = future_to_key.pop(future)
+        dag.done(view_key)
+        jobs_ended_at[view_key] = time.monotonic()
+        # Determine whether the job succeeded or not
+        if exception := future.exception():
+            exceptions[view_key] = exception
+
     executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
-    jobs = {}
+    pending = set()
+    future_to_key = {}
     execution_order = []
+    # The views which are displayed in the progress table, along with their position. Views which
+    # were already done in a previous run are not displayed.
+    not_done = collections.deque(maxlen=show or None)
+    n_not_done = 0
     jobs_started_at = {}
     jobs_ended_at = {}
     exceptions = {}
     skipped = set()
     cache_path = pathlib.Path(".cache.pkl")
-    cache = set() if fresh or not cache_path.exists() else pickle.loads(cache_path.read_bytes())
+    cache = set()
+    if not fresh and cache_path.exists():
+        try:
+            cache = {
+                tuple(line.split(lea._SEP))
+                for line in cache_path.read_text(encoding="utf-8").splitlines()
+            }
+        # Checkpoints written by older versions of lea are pickled, and are therefore ignored
+        except UnicodeDecodeError:
+            console_log(f"Ignoring outdated checkpoint {cache_path}")
     tic = time.time()
 
     views_sp = "views" if len(cache) > 1 else "view"
     console_log(f"{len(cache):,d} {views_sp} already done")
 
+    # Rename the table references of the views that will be run once and for all, so that the
+    # scheduling loop only has to submit jobs
+    renamed = (
+        {}
+        if dry
+        else {
+            view_key: dag[view_key].rename_table_references(
+                table_reference_mapping=table_reference_mapping
+            )
+            for view_key in selected_view_keys
+            if view_key not in cache
+        }
+    )
+
     with rich.live.Live(display_progress(), vertical_overflow="visible") as live:
         dag.prepare()
+        # Views on the critical path are submitted first, so that long chains of views don't
+        # end up delaying the end of the run
+        bottom_levels = dag.bottom_levels
+        last_render = time.monotonic()
         while dag.is_active():
-            for view_key in dag.get_ready():
-                # Check if the view_key can be skipped or not
-                if view_key not in selected_view_keys:
-                    dag.done(view_key)
-                    continue
-                execution_order.append(view_key)
-
-                # A view can only be computed if all its dependencies have been computed
-                # succesfully
-
-                if any(
-                    dep_key in skipped or dep_key in exceptions
-                    for dep_key in map(
-                        client._table_reference_to_view_key, dag[view_key].dependencies
-                    )
-                ):
+            # Marking a view as done without running it, for instance because it wasn't
+            # selected, may unlock other views. These are dispatched right away, rather than
+            # after waiting for the running jobs.
+            while ready := dag.get_ready():
+                for view_key in sorted(ready, key=lambda vk: -bottom_levels.get(vk, 0)):
+                    # Check if the view_key can be skipped or not
+                    if view_key not in selected_view_keys:
+                        dag.done(view_key)
+                        continue
+                    execution_order.append(view_key)
+                    if view_key not in cache:
+                        n_not_done += 1
+                        not_done.append((n_not_done, view_key))
+
+                    # A view can only be computed if all its dependencies have been computed
+                    # succesfully. The DAG's graph already maps each view to the keys of its
+                    # dependencies, so there is no need to parse table references again here.
+                    if any(
+                        dep_key in skipped or dep_key in exceptions
+                        for dep_key in dag.graph[view_key]
+                    ):
+                        skipped.add(view_key)
+                        dag.done(view_key)
+                        continue
+
+                    # Submit a job, or print, or do nothing
+                    if dry or view_key in cache:
+                        job = _do_nothing
+                    elif print_views:
+                        job = functools.partial(
+                            pretty_print_view, view=renamed[view_key], console=console
+                        )
+                    else:
+                        job = functools.partial(client.materialize_view, view=renamed[view_key])
+                    future = executor.submit(job)
+                    pending.add(future)
+                    future_to_key[future] = view_key
+                    jobs_started_at[view_key] = time.monotonic()
+
+            # Wait for at least one job to be done, instead of polling every job
+            done, pending = concurrent.futures.wait(
+                pending, timeout=REFRESH_INTERVAL, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                end_job(future)
+
+            # In fail fast mode, there's no point in waiting for the rest of the DAG. The jobs
+            # which haven't started yet are cancelled, and the views they were for are skipped.
+            # The jobs which are already running are waited for, so that they don't keep writing
+            # to the warehouse once the run is over.
+            if fail_fast and exceptions:
+                executor.shutdown(wait=False, cancel_futures=True)
+                cancelled = {future for future in pending if future.cancelled()}
+                for future in cancelled:
+                    view_key = future_to_key.pop(future)
                     skipped.add(view_key)
-                    dag.done(view_key)
-                    continue
-
-                # Submit a job, or print, or do nothing
-                if dry or view_key in cache:
-                    job = _do_nothing
-                elif print_views:
-                    job = functools.partial(
-                        pretty_print_view,
-                        view=dag[view_key].rename_table_references(
-                            table_reference_mapping=table_reference_mapping
-                        ),
-                        console=console,
-                    )
-                else:
-                    job = functools.partial(
-                        client.materialize_view,
-                        view=dag[view_key].rename_table_references(
-                            table_reference_mapping=table_reference_mapping
-                        ),
-                    )
-                jobs[view_key] = executor.submit(job)
-                jobs_started_at[view_key] = dt.datetime.now()
+                    del jobs_started_at[view_key]
+                done, _ = concurrent.futures.wait(pending - cancelled)
+                for future in done:
+                    end_job(future)
+                break
 
-            # Check if any jobs are done. We notify the DAG by calling done when a job is done,
-            # which will unlock the next views.
-            for view_key in jobs_started_at:
-                if view_key not in jobs_ended_at and jobs[view_key].done():
-                    dag.done(view_key)
-                    jobs_ended_at[view_key] = dt.datetime.now()
-                    # Determine whether the job succeeded or not
-                    if exception := jobs[view_key].exception():
-                        exceptions[view_key] = exception
+            # Rendering the progress table is not free, so we don't do it too often
+            if time.monotonic() - last_render >= RENDER_INTERVAL:
+                live.update(display_progress())
+                last_render = time.monotonic()
 
-            live.update(display_progress())
+        live.update(display_progress())
 
     # Save the cache
     all_done = not exceptions and not skipped
@@ -350,11 +411,14 @@ def run(
         | {
             view_key
             for view_key in execution_order
-            if view_key not in exceptions and view_key not in skipped
+            # Views which were still running when the run stopped are not done
+            if view_key in jobs_ended_at and view_key not in exceptions
         }
     )
     if cache:
-        cache_path.write_bytes(pickle.dumps(cache))
+        cache_path.write_text(
+            "\n".join(lea._SEP.join(view_key) for view_key in cache), encoding="utf-8"
+        )
     else:
         cache_path.unlink(missing_ok=True)
 
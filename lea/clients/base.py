@@ -97,10 +97,20 @@ class Client(abc.ABC):
     def delete_view_key(self, view_key: tuple[str]):
         ...
 
+    def delete_view_keys(self, view_keys: list[tuple[str]]):
+        for view_key in view_keys:
+            self.delete_view_key(view_key)
+
     @abc.abstractmethod
     def list_tables(self) -> pd.DataFrame:
         ...
 
+    def list_table_view_keys(self) -> list[tuple[str]]:
+        return [
+            self._table_reference_to_view_key(table_reference)
+            for table_reference in self.list_tables()["table_reference"]
+        ]
+
     @abc.abstractmethod
     def list_columns(self) -> pd.DataFrame:
         ...
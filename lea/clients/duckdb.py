@@ -40,12 +40,22 @@ class DuckDB(Client):
             console.log(f"Created schema {schema}")
 
     def _materialize_pandas_dataframe(self, view_key: tuple[str], dataframe: pd.DataFrame):
-        self.con.sql(
-            f"CREATE OR REPLACE TABLE {self._view_key_to_table_reference(view_key)} AS SELECT * FROM dataframe"
-        )
+        # The dataframe is registered explicitly, rather than relying on a replacement scan.
+        # Registrations are scoped to a connection, so a cursor is used to avoid collisions between
+        # views that are materialized concurrently.
+        name = f"_lea_{lea._SEP.join(view_key)}"
+        con = self.con.cursor()
+        con.register(name, dataframe)
+        try:
+            con.sql(
+                f"CREATE OR REPLACE TABLE {self._view_key_to_table_reference(view_key)} AS SELECT * FROM {name}"
+            )
+        finally:
+            con.unregister(name)
 
     def _materialize_sql_query(self, view_key: tuple[str], query: str):
-        self.con.sql(
+        # Each materialization gets its own cursor, so that they can run in parallel threads
+        self.con.cursor().sql(
             f"CREATE OR REPLACE TABLE {self._view_key_to_table_reference(view_key)} AS ({query})"
         )
 
@@ -57,6 +67,42 @@ class DuckDB(Client):
         table_reference = self._view_key_to_table_reference(view_key)
         self.con.sql(f"DROP TABLE IF EXISTS {table_reference}")
 
+    def delete_view_keys(self, view_keys: list[tuple[str]]):
+        """
+
+        The tables are dropped in a single transaction, with one call to execute. This saves a
+        round-trip and an autocommit per table.
+
+        >>> client = DuckDB(path=":memory:", username=None)
+        >>> client.con.sql("CREATE SCHEMA core")
+        >>> client.con.sql("CREATE TABLE core.orders (order_id INT)")
+        >>> client.con.sql("CREATE TABLE core.finance__kpis (metric TEXT)")
+        >>> client.con.sql("CREATE TABLE core.customers (customer_id INT)")
+
+        >>> client.delete_view_keys([('core', 'orders'), ('core', 'finance', 'kpis')])
+        >>> client.list_table_view_keys()
+        [('core', 'customers')]
+
+        """
+        if not view_keys:
+            return
+        drops = "".join(
+            "DROP TABLE IF EXISTS "
+            + ".".join(
+                '"' + part.replace('"', '""') + '"'
+                for part in self._view_key_to_table_reference(view_key).split(".")
+            )
+            + ";\n"
+            for view_key in view_keys
+        )
+        self.con.execute("BEGIN TRANSACTION")
+        try:
+            self.con.execute(f"{drops}COMMIT;")
+        except Exception:
+            # Otherwise the connection would be stuck in an aborted transaction
+            self.con.execute("ROLLBACK")
+            raise
+
     def teardown(self):
         os.remove(self.path)
 
@@ -70,6 +116,28 @@ class DuckDB(Client):
         """
         return self.con.sql(query).df()
 
+    def list_table_view_keys(self) -> list[tuple[str]]:
+        """
+
+        This is equivalent to converting each table reference from list_tables into a view key,
+        except that it skips building a pandas DataFrame.
+
+        >>> client = DuckDB(path=":memory:", username=None)
+        >>> client.con.sql("CREATE SCHEMA core")
+        >>> client.con.sql("CREATE TABLE core.orders (order_id INT)")
+        >>> client.con.sql("CREATE TABLE core.finance__kpis (metric TEXT)")
+
+        >>> sorted(client.list_table_view_keys())
+        [('core', 'finance', 'kpis'), ('core', 'orders')]
+
+        """
+        return [
+            (schema, *table_name.split(lea._SEP))
+            for schema, table_name in self.con.sql(
+                "SELECT schema_name, table_name FROM duckdb_tables()"
+            ).fetchall()
+        ]
+
     def list_columns(self) -> pd.DataFrame:
         query = f"""
         SELECT
@@ -92,8 +160,7 @@ class DuckDB(Client):
         'schema.subschema__table'
 
         """
-        schema, *leftover = view_key
-        table_reference = f"{schema}.{lea._SEP.join(leftover)}"
+        table_reference = f"{view_key[0]}.{lea._SEP.join(view_key[1:])}"
         if with_username and self.username:
             table_reference = f"{self.path.stem}.{table_reference}"
         return table_reference
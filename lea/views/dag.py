@@ -45,6 +45,50 @@ class DAGOfViews(graphlib.TopologicalSorter, collections.UserDict):
 
         return list(_list_descendants(node))
 
+    @property
+    def bottom_levels(self) -> dict:
+        """The length of the longest chain of views that starts with each view.
+
+        A view that no other view depends on has a bottom level of 1. Views with a high bottom level
+        are on the critical path of the DAG, and should therefore be run first.
+
+        Examples
+        --------
+
+        >>> import lea
+
+        >>> client = lea.clients.DuckDB(':memory:')
+        >>> views = client.open_views('examples/jaffle_shop/views')
+        >>> views = [v for v in views if v.schema != 'tests']
+        >>> dag = client.make_dag(views)
+
+        >>> for key, level in sorted(dag.bottom_levels.items()):
+        ...     print('.'.join(key), level)
+        analytics.finance.kpis 1
+        analytics.kpis 1
+        core.customers 2
+        core.orders 2
+        staging.customers 3
+        staging.orders 3
+        staging.payments 3
+
+        """
+        children = collections.defaultdict(list)
+        for child, parents in self.graph.items():
+            for parent in parents:
+                children[parent].append(child)
+
+        # The levels are computed iteratively, from the last views to the first ones, to avoid
+        # hitting the recursion limit on long chains. A fresh sorter is used because this one may
+        # already have been prepared.
+        bottom_levels = {}
+        for node in reversed(list(graphlib.TopologicalSorter(self.graph).static_order())):
+            bottom_levels[node] = 1 + max(
+                (bottom_levels[child] for child in children[node]), default=0
+            )
+
+        return {key: bottom_levels[key] for key in self}
+
     @property
     def roots(self):
         """A root is a view that doesn't depend on any other view.
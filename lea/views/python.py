@@ -1,48 +1,71 @@
 from __future__ import annotations
 
 import ast
-import importlib
+import functools
+import warnings
+
+import sqlglot
 
 from .base import View
 from .sql import SQLView
 
 
 class PythonView(View):
-    @property
+    @functools.cached_property
     def source_code(self):
         return self.path.read_text()
 
-    @property
+    @functools.cached_property
+    def _ast(self):
+        return ast.parse(self.source_code)
+
+    @functools.cached_property
     def dependencies(self):
-        def _dependencies():
-            for node in ast.walk(ast.parse(self.source_code)):
-                # pd.read_gbq
-                try:
-                    if (
-                        isinstance(node, ast.Call)
-                        and node.func.value.id == "pd"
-                        and node.func.attr == "read_gbq"
-                    ):
-                        yield from SQLView.parse_dependencies(node.args[0].value)
-                except AttributeError:
-                    pass
-
-                # .query
+        path = self.path
+
+        class _DepVisitor(ast.NodeVisitor):
+            def __init__(self):
+                self.deps = set()
+
+            def add_dependencies(self, query, sqlglot_dialect):
+                # Not every string passed to a query method is SQL, for instance pandas'
+                # DataFrame.query expressions. Those that sqlglot can't parse are skipped with a
+                # warning.
                 try:
-                    if isinstance(node, ast.Call) and node.func.attr.startswith("query"):
-                        yield from SQLView.parse_dependencies(node.args[0].value)
-                except AttributeError:
-                    pass
+                    self.deps.update(SQLView.parse_dependencies(query, sqlglot_dialect))
+                except (sqlglot.errors.ParseError, sqlglot.errors.TokenError):
+                    warnings.warn(
+                        f"SQLGlot couldn't parse a query in {path} with dialect {sqlglot_dialect}. Its dependencies are ignored."
+                    )
+
+            def visit_Call(self, node):
+                if (
+                    isinstance(node.func, ast.Attribute)
+                    and node.args
+                    and isinstance(node.args[0], ast.Constant)
+                    and isinstance(node.args[0].value, str)
+                ):
+                    # pd.read_gbq
+                    if node.func.attr == "read_gbq":
+                        if isinstance(node.func.value, ast.Name) and node.func.value.id == "pd":
+                            self.add_dependencies(
+                                node.args[0].value, sqlglot.dialects.Dialects.BIGQUERY
+                            )
+                    # .query, for instance a BigQuery client's
+                    elif node.func.attr.startswith("query"):
+                        self.add_dependencies(
+                            node.args[0].value, sqlglot.dialects.Dialects.BIGQUERY
+                        )
+                self.generic_visit(node)
 
-        return set(_dependencies())
+        visitor = _DepVisitor()
+        visitor.visit(self._ast)
+        return frozenset(visitor.deps)
 
     @property
     def description(self):
-        module_name = self.path.stem
-        spec = importlib.util.spec_from_file_location(module_name, self.path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module.__doc__
+        # The docstring is read from the syntax tree, so that the module doesn't have to be executed
+        return ast.get_docstring(self._ast)
 
     def extract_comments(self, columns: list[str]):
         return {}
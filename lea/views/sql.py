@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import collections
 import dataclasses
+import functools
 import itertools
 import os
 import re
@@ -51,8 +52,10 @@ class SQLView(View):
             return template.render(env=os.environ)
         return text
 
-    def parse_dependencies(self, query) -> set[str]:
-        expression = sqlglot.parse_one(query, dialect=self.sqlglot_dialect)
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse_dependencies(query: str, sqlglot_dialect: sqlglot.Dialect) -> frozenset[str]:
+        expression = sqlglot.parse_one(query, dialect=sqlglot_dialect)
         dependencies = set()
 
         for scope in sqlglot.optimizer.scope.traverse_scope(expression):
@@ -63,12 +66,13 @@ class SQLView(View):
                 ):
                     dependencies.add(sqlglot.exp.table_name(table))
 
-        return dependencies
+        # The result is cached, so it must not be mutable
+        return frozenset(dependencies)
 
     @property
     def dependencies(self):
         try:
-            return self.parse_dependencies(self.query)
+            return self.parse_dependencies(self.query, self.sqlglot_dialect)
         except sqlglot.errors.ParseError:
             warnings.warn(
                 f"SQLGlot couldn't parse {self.path} with dialect {self.sqlglot_dialect}. Falling back to regex."
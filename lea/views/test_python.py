@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pathlib
+
+import lea
+
+
+def test_dependencies(tmp_path):
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "orders.py").write_text(
+        """
+import pandas as pd
+
+orders = pd.read_gbq("SELECT * FROM staging.orders JOIN staging.customers USING (customer_id)")
+orders = orders.query("amount > 0")
+orders = orders.query("`order id` > 1")
+payments = client.query("SELECT * FROM `staging.payments`").to_dataframe()
+payments = pd.read_gbq(QUERY)
+"""
+    )
+    view = lea.views.PythonView(tmp_path, pathlib.Path("core/orders.py"))
+    assert view.dependencies == {"staging.orders", "staging.customers", "staging.payments"}
+
+
+def test_description(tmp_path):
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "orders.py").write_text(
+        '''"""Docstring for the orders view."""
+
+raise RuntimeError("The module should not be executed")
+'''
+    )
+    view = lea.views.PythonView(tmp_path, pathlib.Path("core/orders.py"))
+    assert view.description == "Docstring for the orders view."
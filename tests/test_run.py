@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import duckdb
+from typer.testing import CliRunner
+
+from lea.app import make_app
+from lea.clients import make_client
+
+runner = CliRunner()
+
+
+def test_fail_fast(tmp_path, monkeypatch):
+    app = make_app(make_client=make_client)
+    views_path = tmp_path / "views"
+    (views_path / "staging").mkdir(parents=True)
+    (views_path / "core").mkdir()
+
+    # staging.slow is submitted first because core.after depends on it. It is still running when
+    # staging.broken fails.
+    (views_path / "staging" / "slow.py").write_text(
+        """
+import time
+
+import pandas as pd
+
+time.sleep(1)
+slow = pd.DataFrame({"x": [1, 2, 3]})
+"""
+    )
+    (views_path / "staging" / "broken.sql").write_text("SELECT * FROM raw.missing")
+    (views_path / "core" / "after.sql").write_text("SELECT * FROM staging.slow")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LEA_USERNAME", "max")
+    monkeypatch.setenv("LEA_WAREHOUSE", "duckdb")
+    monkeypatch.setenv("LEA_DUCKDB_PATH", str(tmp_path / "fail_fast.db"))
+
+    assert runner.invoke(app, ["prepare", str(views_path)]).exit_code == 0
+    result = runner.invoke(
+        app, ["run", str(views_path), "--fresh", "--fail-fast", "--threads", "2"]
+    )
+    assert result.exit_code != 0
+    assert str(result.exception) == "Some views failed to build"
+
+    # The view which was running when the other one failed was waited for
+    with duckdb.connect(str(tmp_path / "fail_fast_max.db")) as con:
+        tables = con.sql(
+            "SELECT table_schema, table_name FROM information_schema.tables"
+        ).fetchall()
+    assert tables == [("staging", "slow")]
+
+    # It is part of the checkpoint, while the views which didn't succeed are not
+    assert (tmp_path / ".cache.pkl").read_text().splitlines() == ["staging__slow"]